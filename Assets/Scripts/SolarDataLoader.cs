@@ -23,6 +23,11 @@ public class SolarDataLoader : MonoBehaviour
     const int MINUTES_PER_DAY = 1440;
     const int HEADER_BYTES    = 16;     // 4 magic + 2 version + 2 year + 4 totalMinutes + 4 reserved
 
+    // Version 1: float32 azimuth + float32 elevation per minute (8 bytes)
+    // Version 2: uint16 azimuth×100 + uint16 (elevation+90)×100 per minute (4 bytes)
+    //            written by generate_solar_data.py --quantize int16
+    const float QUANT_SCALE   = 100f;
+
     // ------------------------------------------------------------------
     // Public API
     // ------------------------------------------------------------------
@@ -43,20 +48,31 @@ public class SolarDataLoader : MonoBehaviour
 
         using var reader = new BinaryReader(File.Open(path, FileMode.Open, FileAccess.Read));
 
-        if (!ReadAndValidateHeader(reader, year, out int totalMinutes))
+        if (!ReadAndValidateHeader(reader, year, out int version, out int totalMinutes))
             return false;
 
         _totalMinutes = totalMinutes;
         _data = new float[totalMinutes * 2];
 
-        for (int i = 0; i < totalMinutes; i++)
+        if (version == 2)
+        {
+            for (int i = 0; i < totalMinutes; i++)
+            {
+                _data[i * 2]     = reader.ReadUInt16() / QUANT_SCALE;        // azimuth
+                _data[i * 2 + 1] = reader.ReadUInt16() / QUANT_SCALE - 90f;  // elevation
+            }
+        }
+        else
         {
-            _data[i * 2]     = reader.ReadSingle(); // azimuth
-            _data[i * 2 + 1] = reader.ReadSingle(); // elevation
+            for (int i = 0; i < totalMinutes; i++)
+            {
+                _data[i * 2]     = reader.ReadSingle(); // azimuth
+                _data[i * 2 + 1] = reader.ReadSingle(); // elevation
+            }
         }
 
         _loadedYear = year;
-        long fileBytes = totalMinutes * 8L + HEADER_BYTES;
+        long fileBytes = totalMinutes * (version == 2 ? 4L : 8L) + HEADER_BYTES;
         Debug.Log($"[SolarDataLoader] Loaded {cityName} {year}: {totalMinutes:N0} minutes ({fileBytes / 1024f / 1024f:F1} MB read)");
         return true;
     }
@@ -107,8 +123,9 @@ public class SolarDataLoader : MonoBehaviour
     string BinPath(int year) =>
         Path.Combine(Application.streamingAssetsPath, "SolarData", cityName, $"sun_pos_{year}.bin");
 
-    bool ReadAndValidateHeader(BinaryReader reader, int expectedYear, out int totalMinutes)
+    bool ReadAndValidateHeader(BinaryReader reader, int expectedYear, out int version, out int totalMinutes)
     {
+        version = 0;
         totalMinutes = 0;
 
         byte s = reader.ReadByte();
@@ -122,12 +139,12 @@ public class SolarDataLoader : MonoBehaviour
             return false;
         }
 
-        short version  = reader.ReadInt16();
+        version        = reader.ReadInt16();
         short fileYear = reader.ReadInt16();
         totalMinutes   = reader.ReadInt32();
         reader.ReadInt32(); // reserved
 
-        if (version != 1)
+        if (version != 1 && version != 2)
         {
             Debug.LogError($"[SolarDataLoader] Unsupported binary version {version}.");
             return false;
@@ -1,18 +1,40 @@
+import datetime
+import functools
+
 import pandas as pd
 import pvlib 
 
+#Locations are reused across calls with the same (lat, lon, tz, altitude)
+@functools.lru_cache(maxsize=1024)
+def _location(lat,lon,tz,altitude):
+  return pvlib.location.Location(lat, lon, tz=tz, altitude=altitude)
+
+#below this many timestamps, accuracy="low" swaps nrel_numpy for the ephemeris algorithm
+SMALL_BATCH = 64
+
 #time should be of the format: time = pd.DatetimeIndex(["2026-02-07 12:00"], tz="America/New_York")
 #this function returns the apparent_zenith, zenith, apparent_elevation, elevation, azimuth, and equation_of_time
-def getSolarPosition(time,latitude,longitude,altitude,method="nrel_numpy"):
+#numthreads is only used by method="nrel_numba" (e.g. numthreads=os.cpu_count())
+#accuracy="low" lets small queries (< SMALL_BATCH times) with method="nrel_numpy" use
+#pvlib's ephemeris instead: ~10x less overhead, within ~0.02 deg, returns solar_time instead of equation_of_time
+def getSolarPosition(time,latitude,longitude,altitude,method="nrel_numpy",numthreads=None,accuracy="high"):
+  if accuracy not in ("low", "high"):
+    raise ValueError(f"accuracy must be 'low' or 'high', got {accuracy!r}")
+  #a single Timestamp (which pvlib accepts) has no len()
+  n_times = 1 if isinstance(time, datetime.datetime) else len(time)
+  if accuracy == "low" and method == "nrel_numpy" and n_times < SMALL_BATCH:
+    method = "ephemeris"
+  kwargs = {} if numthreads is None or method == "ephemeris" else {"numthreads": numthreads}
   return pvlib.solarposition.get_solarposition(
     time=time,
     latitude=latitude,
     longitude=longitude,
     altitude=altitude,
-    method=method
+    method=method,
+    **kwargs
   )
 
-def get_sunrise_sunset(dates, latitude, longitude, altitude=0, tz="America/New_York",fmt="%I:%M %p"):
+def get_sunrise_sunset(dates, latitude, longitude, altitude=0, tz="America/New_York",fmt=None):
     """
     Compute sunrise and sunset times for multiple dates.
     
@@ -28,38 +50,48 @@ def get_sunrise_sunset(dates, latitude, longitude, altitude=0, tz="America/New_Y
         Altitude in meters.
     tz : str, optional
         Timezone name, e.g., 'America/New_York'.
+    fmt : str, optional
+        strftime format, e.g. "%I:%M %p". If given, sunrise/sunset are
+        returned as formatted strings; by default they stay tz-aware
+        Timestamps so callers only format what they need.
         
     Returns
     -------
     pd.DataFrame
-        DataFrame with columns ['sunrise', 'sunset'] indexed by date.
+        DataFrame with columns ['sunrise', 'sunset', 'transit'] indexed by
+        date, or ['sunrise', 'sunset'] strings when fmt is given.
     """
     
-    # Ensure dates are timezone-aware Timestamps
-    if isinstance(dates, list) or isinstance(dates, pd.DatetimeIndex):
-        dates = pd.to_datetime(dates).tz_localize(tz, ambiguous='NaT', nonexistent='shift_forward')
+    # Ensure dates are timezone-aware Timestamps; an index that is already
+    # tz-aware is used as-is instead of being re-parsed
+    if isinstance(dates, pd.DatetimeIndex):
+        if dates.tz is None:
+            dates = dates.tz_localize(tz, ambiguous='NaT', nonexistent='shift_forward')
+    elif isinstance(dates, list):
+        dates = pd.DatetimeIndex(pd.to_datetime(dates)).tz_localize(tz, ambiguous='NaT', nonexistent='shift_forward')
     else:  # single timestamp
-        dates = pd.DatetimeIndex([pd.to_datetime(dates).tz_localize(tz)])
+        dates = pd.Timestamp(dates)
+        dates = pd.DatetimeIndex([dates if dates.tz is not None else dates.tz_localize(tz)])
     
     # Create location
-    location = pvlib.location.Location(latitude=latitude, longitude=longitude, tz=tz, altitude=altitude)
+    location = _location(latitude, longitude, tz, altitude)
     
     # Compute sunrise, sunset, transit
     sun_times = location.get_sun_rise_set_transit(dates)
     
-    sun_times_formatted = sun_times[['sunrise', 'sunset']].copy()
-    sun_times_formatted['sunrise'] = sun_times_formatted['sunrise'].dt.strftime(fmt)
-    sun_times_formatted['sunset']  = sun_times_formatted['sunset'].dt.strftime(fmt)
+    if fmt is None:
+        return sun_times
     
-    return sun_times
+    return pd.DataFrame({
+        'sunrise': sun_times['sunrise'].dt.strftime(fmt),
+        'sunset':  sun_times['sunset'].dt.strftime(fmt),
+    })
 
 def get_the_irradiance(lat,lon,tz,altitude,dates):
     
-    location = pvlib.location.Location(lat, lon, tz=tz, altitude=altitude)
-
-    location = pvlib.location.Location(40.7128, -74.0060, tz="America/New_York", altitude=335)
-    solpos = location.get_solarposition(dates,method="nrel_numpy")
+    location = _location(lat, lon, tz, altitude)
 
+    # get_clearsky computes its own solar position
     clearsky = location.get_clearsky(dates, model="ineichen",linke_turbidity=3.5)
     return clearsky
 
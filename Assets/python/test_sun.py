@@ -5,12 +5,9 @@ latitude = 40.7128
 longitude = -74.0060
 altitude = 10
 
-for hour in range(24):
-    time_str = f"2026-02-07 {hour:02d}:00"
-    time = pd.DatetimeIndex([pd.to_datetime(time_str).tz_localize("America/New_York")])
-    
-    solpos = getSolarPosition(time, latitude, longitude, altitude)
-    zenith = solpos['zenith'].values[0]
-    azimuth = solpos['azimuth'].values[0]
-    
+# one pvlib call for all 24 hours instead of 24 single-row calls
+times = pd.date_range("2026-02-07 00:00", periods=24, freq="1h", tz="America/New_York")
+solpos = getSolarPosition(times, latitude, longitude, altitude)
+
+for hour, (zenith, azimuth) in enumerate(zip(solpos['zenith'].values, solpos['azimuth'].values)):
     print(f"{hour:02d}:00 -> zenith: {zenith:.2f}, azimuth: {azimuth:.2f}")
@@ -15,8 +15,8 @@ def solar():
     lon = float(request.args.get('lon'))
     alt = float(request.args.get('alt'))
     
-    time = pd.DatetimeIndex([pd.to_datetime(time_str).tz_localize("America/New_York")])
-    solpos = getSolarPosition(time, lat, lon, alt)
+    time = pd.DatetimeIndex([pd.Timestamp(time_str, tz="America/New_York")])
+    solpos = getSolarPosition(time, lat, lon, alt, accuracy="low")
     
     return jsonify({
         'zenith': float(solpos['zenith'].values[0]),
@@ -0,0 +1,121 @@
+"""
+spa_kernel.py — Numba-compiled solar position kernel for generate_solar_data.py --fast.
+
+A per-element port of pvlib.solarposition.ephemeris (same constants, Kepler
+iteration and refraction bands) fused into one parallel loop.  Each row reads
+one unix timestamp and writes azimuth/apparent elevation straight into an
+(N, 2) buffer laid out like the binary payload, so none of the ~15
+full-length temporaries of the numpy version are allocated.
+
+Requires numba; generate_solar_data.py falls back to pvlib's ephemeris when
+this module cannot be imported.
+"""
+
+import math
+
+from numba import njit, prange
+
+
+@njit(cache=True)
+def _utc_date(days):
+    """Civil (year, day-of-year) for a count of days since 1970-01-01."""
+    # Howard Hinnant's civil_from_days, extended to day-of-year.
+    z = days + 719468
+    era = (z if z >= 0 else z - 146096) // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    year = yoe + era * 400
+    doy_mar = doe - (365 * yoe + yoe // 4 - yoe // 100)  # 0 = March 1
+    mp = (5 * doy_mar + 2) // 153
+    month = mp + 3 if mp < 10 else mp - 9
+    if month <= 2:
+        year += 1
+
+    leap = (year % 4 == 0 and year % 100 != 0) or year % 400 == 0
+    if month <= 2:
+        doy = doy_mar - 306 + 1            # Jan 1 is 306 days after Mar 1
+    else:
+        doy = doy_mar + 59 + 1 + (1 if leap else 0)
+    return year, doy
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def fill_sun_pos(unix, latitude, longitude, pressure, temperature, out):
+    """
+    Fill out[i, 0] = azimuth and out[i, 1] = apparent elevation (degrees)
+    for each unix timestamp (seconds, UTC) in unix.
+
+    pressure is in Pa and temperature in °C, as for pvlib's ephemeris.
+    out must be a float64 or float32 array of shape (len(unix), 2).
+    """
+    lon_w = -longitude      # the ephemeris formulae use west-positive longitude
+    lat_r = math.radians(latitude)
+    sin_lat = math.sin(lat_r)
+    cos_lat = math.cos(lat_r)
+    abber = 20.0 / 3600.0
+    refract_scale = (283.0 / (273.0 + temperature)) * (pressure / 101325.0) / 3600.0
+
+    for i in prange(unix.size):
+        days = int(math.floor(unix[i] / 86400.0))
+        univ_hr = (unix[i] - days * 86400.0) / 3600.0
+        year, doy = _utc_date(days)
+
+        yr = year - 1900
+        ezero = 365.0 * yr + math.floor((yr - 1) / 4.0) - 0.5 + doy
+        t = ezero / 36525.0
+
+        # Greenwich mean / local apparent sidereal time
+        gmst0 = 6 / 24.0 + 38 / 1440.0 + (
+            45.836 + 8640184.542 * t + 0.0929 * t * t) / 86400.0
+        gmst0 = 360.0 * (gmst0 - math.floor(gmst0))
+        gmst = (gmst0 + 360.0 * (1.0027379093 * univ_hr / 24.0)) % 360.0
+        loc_ast = (360.0 + gmst - lon_w) % 360.0
+
+        epoch = ezero + univ_hr / 24.0
+        t1 = epoch / 36525.0
+
+        obliquity = math.radians(
+            23.452294 - 0.0130125 * t1 - 1.64e-06 * t1 ** 2 + 5.03e-07 * t1 ** 3)
+        perigee = 281.22083 + 4.70684e-05 * epoch + 0.000453 * t1 ** 2 + 3e-06 * t1 ** 3
+        mean_anom = (358.47583 + 0.985600267 * epoch
+                     - 0.00015 * t1 ** 2 - 3e-06 * t1 ** 3) % 360.0
+        eccen = 0.01675104 - 4.18e-05 * t1 - 1.26e-07 * t1 ** 2
+
+        # Kepler's equation by fixed-point iteration
+        ecc_anom = mean_anom
+        e = 0.0
+        while abs(ecc_anom - e) > 0.0001:
+            e = ecc_anom
+            ecc_anom = mean_anom + math.degrees(eccen) * math.sin(math.radians(e))
+
+        true_anom = 2.0 * (math.degrees(math.atan2(
+            math.sqrt((1 + eccen) / (1 - eccen)) * math.tan(math.radians(ecc_anom) / 2.0),
+            1.0)) % 360.0)
+        ec_lon = math.radians((perigee + true_anom) % 360.0 - abber)
+
+        dec = math.asin(math.sin(obliquity) * math.sin(ec_lon))
+        rt_ascen = math.degrees(math.atan2(math.cos(obliquity) * math.sin(ec_lon),
+                                           math.cos(ec_lon)))
+        hr_angle = math.radians(loc_ast - rt_ascen)
+
+        az = math.degrees(math.atan2(-math.sin(hr_angle),
+                                     cos_lat * math.tan(dec) - sin_lat * math.cos(hr_angle)))
+        if az < 0.0:
+            az += 360.0
+
+        el = math.degrees(math.asin(cos_lat * math.cos(dec) * math.cos(hr_angle)
+                                    + sin_lat * math.sin(dec)))
+
+        # Atmospheric refraction (arcseconds before scaling), pvlib's bands
+        tan_el = math.tan(math.radians(el))
+        if 5.0 < el <= 85.0:
+            refract = 58.1 / tan_el - 0.07 / tan_el ** 3 + 8.6e-05 / tan_el ** 5
+        elif -0.575 < el <= 5.0:
+            refract = el * (-518.2 + el * (103.4 + el * (-12.79 + el * 0.711))) + 1735.0
+        elif -1.0 < el <= -0.575:
+            refract = -20.774 / tan_el
+        else:
+            refract = 0.0
+
+        out[i, 0] = az
+        out[i, 1] = el + refract * refract_scale